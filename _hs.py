@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+_hs.py
+----------------------------------------------------------
+Modifier, stage/severity and temporal status for a piece of
+clinical text in a single Hyperscan scan, for pipelines that
+need all three labels per note. Falls back to the individual
+detectors when Hyperscan is not installed.
+"""
+
+from modifiers import _MODIFIER_MATCHER
+from pattern_engine import MultiMatcher
+from severity_stage import STAGING_LABELS, _STAGING_MATCHER
+from temporal_status import TEMPORAL_LABELS, _TEMPORAL_MATCHER
+
+# One database over all three pattern sets, compiled on the first call.
+_ALL_MATCHER = MultiMatcher([_MODIFIER_MATCHER, _STAGING_MATCHER, _TEMPORAL_MATCHER])
+
+
+def detect_all(text) -> tuple:
+    """
+    Returns (modifier, stage, temporal) labels, identical to calling
+    detect_modifier, detect_stage_or_severity and detect_temporal_status
+    over the whole text (scan_window=None).
+    """
+    modifier, stage, temporal = _ALL_MATCHER.search(text)
+    return (
+        modifier or "unspecified",
+        STAGING_LABELS[stage] if stage else "unspecified",
+        TEMPORAL_LABELS[temporal] if temporal else "unspecified",
+    )
+
+
+if __name__ == "__main__":
+    test_cases = [
+        "Acute on chronic systolic heart failure, NYHA class III, worsening",
+        "CKD stage 3, chronic stable at baseline",
+        "New onset atrial fibrillation",
+        "Stage IVB breast carcinoma in remission",
+        "Hx of COPD, moderate COPD, stable",
+    ]
+
+    print("\nCombined modifier/stage/temporal test run:\n" + "-" * 55)
+    for t in test_cases:
+        print(f"{t:<70} → {detect_all(t)}")
@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+check_matchers.py
+----------------------------------------------------------
+Consistency check for the optional matching backends. Every
+detector is compared with a plain per-pattern `re` reference
+(the first PRIORITY key with any pattern matching) over a
+generated corpus, called with a string, with a ParsedNote and
+through its _batch function. Supporting-data extraction is
+compared with one re.finditer per pattern. _hs.detect_all (str
+and ParsedNote) and scanner.analyze are compared with the separate
+detectors. cmsiphy.extract_diagnoses is compared with one
+re.search per diagnosis term.
+
+Also checks the bounded-gap temporal patterns: same answers as
+the unbounded `.*` forms for gaps up to 60 characters, and
+linear time on a long pathological note.
+
+Usage: python check_matchers.py [--without hyperscan,re2,...]
+       python check_matchers.py --all   (every backend combination)
+"""
+
+import argparse
+import importlib
+import itertools
+import random
+import re
+import subprocess
+import sys
+import time
+
+BACKENDS = ("hyperscan", "ahocorasick", "numba", "pcre2", "re2")
+
+# (module, PATTERNS, PRIORITY, detector, LABELS or None for raw keys)
+DETECTORS = [
+    ("complications", "COMPLICATION_PATTERNS", "COMPLICATION_PRIORITY",
+     "detect_complication", "COMPLICATION_LABELS"),
+    ("context_flags", "CONTEXT_PATTERNS", "CONTEXT_PRIORITY", "detect_context", None),
+    ("etiology_context", "ETIOLOGY_PATTERNS", "ETIOLOGY_PRIORITY",
+     "detect_etiology", "ETIOLOGY_LABELS"),
+    ("laterality_location", "LATERALITY_PATTERNS", "LATERALITY_PRIORITY",
+     "detect_laterality", None),
+    ("laterality_location", "LOCATION_PATTERNS", "LOCATION_PRIORITY",
+     "detect_location", "LOCATION_LABELS"),
+    ("modifiers", "MODIFIER_PATTERNS", "MODIFIER_PRIORITY", "detect_modifier", None),
+    ("severity_stage", "STAGING_PATTERNS", "STAGING_PRIORITY",
+     "detect_stage_or_severity", "STAGING_LABELS"),
+    ("temporal_status", "TEMPORAL_PATTERNS", "TEMPORAL_PRIORITY",
+     "detect_temporal_status", "TEMPORAL_LABELS"),
+]
+# Detectors that only scan the lead of a note by default.
+WINDOWED = {"detect_modifier", "detect_temporal_status"}
+
+FILLER = ["with", "on", "of", "the", "and", "after", "vs", "stage", "class",
+          "3", "iv", "ii", "-", ",", "."]
+
+
+def _pattern_words(pattern: str) -> set:
+    text = pattern.replace("\\b", " ").replace("\\d", "7")
+    return {w for w in re.findall(r"[A-Za-z0-9/%.]+", text) if len(w) > 1}
+
+
+def build_corpus(modules: dict, size: int = 4000) -> list:
+    """Random word salads from the pattern vocabulary, plus keyword variants."""
+    from pattern_engine import _keyword_variants
+
+    vocab, extra = set(), []
+    for mod, patterns_name, *_ in DETECTORS:
+        for patterns in getattr(modules[mod], patterns_name).values():
+            for p in patterns:
+                vocab |= _pattern_words(p)
+                for kw in _keyword_variants(p) or ():
+                    extra += [kw, kw.upper(), "x" + kw, kw + "s", f"the {kw} now",
+                              kw + "-x", "é" + kw]
+                    # Characters IGNORECASE folds to ASCII letters but
+                    # lower() doesn't ("ſ", "ı"), or only to two characters ("İ").
+                    extra += {kw.replace("s", "ſ"), kw.replace("i", "ı"),
+                              kw.replace("i", "İ"), kw.upper().replace("I", "İ")} - {kw}
+    vocab = sorted(vocab) + FILLER
+    rnd = random.Random(1)
+    texts = []
+    for _ in range(size):
+        words = [rnd.choice(vocab) for _ in range(rnd.randint(0, 14))]
+        words = [w.upper() if rnd.random() < 0.2 else
+                 w.capitalize() if rnd.random() < 0.2 else w for w in words]
+        texts.append(" ".join(words))
+    # A few long notes, so truncation-free (full) scans are exercised too.
+    texts += [" ".join(rnd.choice(vocab) for _ in range(200)) for _ in range(20)]
+    return texts + extra
+
+
+def check_detectors(modules: dict, texts: list) -> int:
+    from pattern_engine import ParsedNote
+
+    notes = [ParsedNote.parse(t) for t in texts]
+    bad = 0
+    for mod, patterns_name, priority_name, fn, labels_name in DETECTORS:
+        m = modules[mod]
+        patterns, priority = getattr(m, patterns_name), getattr(m, priority_name)
+        labels = getattr(m, labels_name) if labels_name else None
+        compiled = [(k, [re.compile(p, re.IGNORECASE) for p in patterns[k]]) for k in priority]
+        kwargs = {"scan_window": None} if fn in WINDOWED else {}
+        detect, batch = getattr(m, fn), getattr(m, fn + "_batch")
+
+        got = zip(
+            [detect(t, **kwargs) for t in texts],
+            [detect(n, **kwargs) for n in notes],
+            batch(texts, **kwargs),
+            batch(notes, **kwargs),
+        )
+        for text, results in zip(texts, got):
+            key = next((k for k, rxs in compiled if any(rx.search(text) for rx in rxs)), None)
+            ref = (labels[key] if labels else key) if key else "unspecified"
+            if any(r != ref for r in results):
+                bad += 1
+                if bad <= 10:
+                    print(f"  MISMATCH {fn}({text!r}): expected {ref!r}, got {results}")
+    return bad
+
+
+def check_combined(texts: list) -> int:
+    """_hs.detect_all and scanner.analyze against the separate detectors."""
+    from _hs import detect_all
+    from modifiers import detect_modifier
+    from pattern_engine import ParsedNote
+    from scanner import analyze
+    from severity_stage import detect_stage_or_severity
+    from supporting_data_rules import extract_supporting_data
+    from temporal_status import detect_temporal_status
+
+    bad = 0
+    for text in texts:
+        ref = (
+            detect_modifier(text, scan_window=None),
+            detect_stage_or_severity(text),
+            detect_temporal_status(text, scan_window=None),
+        )
+        ref_analysis = dict(zip(("modifier", "stage", "temporal"), ref),
+                            supporting=extract_supporting_data(text))
+        got = [detect_all(text), detect_all(ParsedNote.parse(text))]
+        analysis = analyze(text)
+        if any(g != ref for g in got) or analysis != ref_analysis:
+            bad += 1
+            if bad <= 10:
+                print(f"  MISMATCH detect_all/analyze({text!r}): expected {ref!r}, "
+                      f"got {got} and {analysis}")
+    return bad
+
+
+def check_diagnoses(texts: list) -> int:
+    """extract_diagnoses against one word-bounded re.search per term."""
+    import cmsiphy
+
+    bad = 0
+    variants = []
+    for term in cmsiphy._DX_TERMS:
+        variants += [term, term.upper(), f"hx of {term.lower()}", term.replace("s", "ſ"),
+                     term.replace("i", "ı"), term.upper().replace("I", "İ")]
+    for text in texts + variants:
+        found = [t for t in cmsiphy._DX_TERMS
+                 if re.search(rf"\b{re.escape(t)}\b", text, re.IGNORECASE)]
+        ref = sorted(found) or ["⚠️ No clear diagnoses found"]
+        got = cmsiphy.extract_diagnoses(text)
+        if got != ref:
+            bad += 1
+            if bad <= 10:
+                print(f"  MISMATCH extract_diagnoses({text!r}): {ref!r} vs {got!r}")
+    return bad
+
+
+def check_supporting(texts: list) -> int:
+    import supporting_data_rules as sd
+
+    compiled = [re.compile(p, re.IGNORECASE) for p in sd._SUPPORT_PATTERNS]
+    bad = 0
+    for text in texts + ["Glucose 340, on insulin glargine. Hgb 9.2. O2 sat 94% on RA.",
+                         "on O2 sat 90", "pt us PT 12 US abdomen"]:
+        found = {m.group(0).strip() for rx in compiled for m in rx.finditer(text)}
+        ref = ", ".join(sorted(found)) if found else "⚠️ No supporting data"
+        # A large max_items disables the early stop, so every finding counts.
+        got = sd.extract_supporting_data(text, max_items=len(found) + 1)
+        if got != ref:
+            bad += 1
+            if bad <= 10:
+                print(f"  MISMATCH extract_supporting_data({text!r}): {ref!r} vs {got!r}")
+    return bad
+
+
+def check_bounded_gaps() -> int:
+    """The .{0,60}? temporal gaps against their original .* forms."""
+    from temporal_status import TEMPORAL_PATTERNS, detect_temporal_status
+
+    bad = 0
+    bounded = [p for ps in TEMPORAL_PATTERNS.values() for p in ps if ".{0,60}?" in p]
+    for p in bounded:
+        rx = re.compile(p, re.IGNORECASE)
+        unbounded = re.compile(p.replace(".{0,60}?", ".*"), re.IGNORECASE)
+        for head, tail in (("chronic", "stable"), ("after", "event"), ("after", "episode")):
+            for gap in (0, 1, 30, 58):
+                text = f"{head} {'x' * gap} {tail}"
+                if bool(rx.search(text)) != bool(unbounded.search(text)):
+                    bad += 1
+                    print(f"  MISMATCH bounded gap {p!r} on {text!r}")
+
+    # Many openers and no closer: the old .* gaps rescanned to the end of
+    # the note from every opener (quadratic); bounded gaps stay linear.
+    for text in ("chronic " * 5000, "after " * 5000):
+        start = time.perf_counter()
+        detect_temporal_status(text, scan_window=None)
+        elapsed = time.perf_counter() - start
+        if elapsed > 0.25:
+            bad += 1
+            print(f"  SLOW {text[:16]!r}... x{len(text)} chars: {elapsed:.2f}s")
+    return bad
+
+
+def run(without: list) -> int:
+    for name in without:
+        sys.modules[name] = None  # makes `import name` raise ImportError
+    modules = {mod: importlib.import_module(mod) for mod, *_ in DETECTORS}
+    texts = build_corpus(modules)
+    bad = (
+        check_detectors(modules, texts)
+        + check_combined(texts)
+        + check_diagnoses(texts)
+        + check_supporting(texts)
+        + check_bounded_gaps()
+    )
+    print(f"without {','.join(without) or '-':<40} {len(texts)} texts, mismatches: {bad}")
+    return bad
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--without", default="", help="comma-separated backends to disable")
+    parser.add_argument("--all", action="store_true", help="check every backend combination")
+    args = parser.parse_args()
+
+    if not args.all:
+        sys.exit(1 if run([b for b in args.without.split(",") if b]) else 0)
+    failed = 0
+    for n in range(len(BACKENDS) + 1):
+        for combo in itertools.combinations(BACKENDS, n):
+            cmd = [sys.executable, __file__, "--without", ",".join(combo)]
+            failed += subprocess.run(cmd).returncode != 0
+    sys.exit(1 if failed else 0)
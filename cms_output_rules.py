@@ -7,6 +7,14 @@ and contextual elements into a structured, CMS-compliant
 diagnostic phrase hierarchy for output formatting.
 """
 
+import functools
+
+# Field values that mean "not documented" and are left out of the phrase.
+_ABSENT = frozenset({None, "", "unspecified"})
+
+
+# Problem lists repeat the same field combinations across many notes.
+@functools.lru_cache(maxsize=8192)
 def assemble_cms_phrase(
     base_diagnosis: str,
     modifier: str = "unspecified",
@@ -25,52 +33,45 @@ def assemble_cms_phrase(
     Each field is optional; 'unspecified' values are suppressed from output.
     """
 
-    # -------------------------------
-    # Helper function for conditional join
-    # -------------------------------
-    def add_if_present(label):
-        return None if not label or label == "unspecified" else label
-
     parts = []
 
     # 1. Temporal / Modifier first (e.g. "acute", "chronic", "resolving")
-    temporal_part = add_if_present(temporal) or add_if_present(modifier)
-    if temporal_part:
-        parts.append(temporal_part)
+    if temporal not in _ABSENT:
+        parts.append(temporal)
+    elif modifier not in _ABSENT:
+        parts.append(modifier)
 
     # 2. Base diagnosis (core condition)
     parts.append(base_diagnosis.strip())
 
     # 3. Stage / Severity
-    for piece in (add_if_present(stage), add_if_present(severity)):
-        if piece and piece not in parts:
+    seen = set(parts)
+    for piece in (stage, severity):
+        if piece not in _ABSENT and piece not in seen:
             parts.append(piece)
+            seen.add(piece)
 
     # 4. Complication / Manifestation
-    if add_if_present(complication):
+    if complication not in _ABSENT:
         parts.append(f"with {complication}")
 
     # 5. Etiology / Context
-    if add_if_present(etiology):
-        if not etiology.startswith("with") and etiology not in ("unspecified", "none"):
-            parts.append(f"due to {etiology}")
+    if etiology not in _ABSENT and etiology != "none" and not etiology.startswith("with"):
+        parts.append(f"due to {etiology}")
 
     # 6. Laterality + Location
-    spatial = []
-    if add_if_present(laterality):
-        spatial.append(laterality)
-    if add_if_present(location):
-        spatial.append(location)
+    spatial = [label for label in (laterality, location) if label not in _ABSENT]
     if spatial:
         parts.append(" ".join(spatial))
 
     # 7. Context qualifiers
-    if add_if_present(context) and context not in ("unspecified", "none"):
+    if context not in _ABSENT and context != "none":
         parts.append(f"({context})")
 
     # 8. Join all descriptive parts
     diagnosis_phrase = " ".join(parts).strip()
-    diagnosis_phrase = diagnosis_phrase[0].upper() + diagnosis_phrase[1:]
+    # Slicing keeps an empty phrase (blank diagnosis, nothing else) from raising.
+    diagnosis_phrase = diagnosis_phrase[:1].upper() + diagnosis_phrase[1:]
 
     # 9. Append supporting data if available
     if supporting_data:
@@ -79,6 +80,68 @@ def assemble_cms_phrase(
     return diagnosis_phrase
 
 
+# Below this many problems the per-row loop beats the DataFrame setup cost.
+VECTORIZE_MIN_PROBLEMS = 30000
+
+_PHRASE_FIELDS = [
+    "diagnosis",
+    "modifier",
+    "complication",
+    "stage",
+    "temporal",
+    "laterality",
+    "location",
+    "etiology",
+    "context",
+    "severity",
+]
+
+
+def assemble_cms_phrases_vectorized(problem_objects) -> list:
+    """
+    Column-wise equivalent of calling assemble_cms_phrase() on every item,
+    using pandas string operations instead of a per-problem Python loop.
+    """
+    import pandas as pd
+
+    df = pd.DataFrame(list(problem_objects), columns=_PHRASE_FIELDS + ["supporting_data"])
+    supporting = df.pop("supporting_data").fillna("")
+    df = df.fillna("unspecified")
+
+    def present(name):
+        return df[name].ne("") & df[name].ne("unspecified")
+
+    # Absent parts are NaN and dropped from the join below.
+    base = df["diagnosis"].str.strip()
+    temporal = df["temporal"].where(present("temporal"), df["modifier"].where(present("modifier")))
+    stage = df["stage"].where(
+        present("stage") & df["stage"].ne(temporal) & df["stage"].ne(base)
+    )
+    severity = df["severity"].where(
+        present("severity")
+        & df["severity"].ne(temporal)
+        & df["severity"].ne(base)
+        & df["severity"].ne(stage)
+    )
+    complication = ("with " + df["complication"]).where(present("complication"))
+    etiology = ("due to " + df["etiology"]).where(
+        present("etiology") & ~df["etiology"].str.startswith("with") & df["etiology"].ne("none")
+    )
+    laterality = df["laterality"].where(present("laterality"))
+    location = df["location"].where(present("location"))
+    context = ("(" + df["context"] + ")").where(present("context") & df["context"].ne("none"))
+
+    # " ".join(parts) == the concatenation of " " + part, minus the first space,
+    # which strip() removes anyway.
+    phrase = " " + base
+    for part in (stage, severity, complication, etiology, laterality, location, context):
+        phrase = phrase + (" " + part).fillna("")
+    phrase = ((" " + temporal).fillna("") + phrase).str.strip()
+    phrase = phrase.str[:1].str.upper() + phrase.str[1:]
+    phrase = phrase + (" — " + supporting).where(supporting.ne(""), "")
+    return phrase.tolist()
+
+
 def build_cms_problem_list(problem_objects):
     """
     Takes a list of dicts, each containing problem components,
@@ -99,20 +162,15 @@ def build_cms_problem_list(problem_objects):
         }
     """
     lines = ["# CMS-Ready Problem List"]
+    problem_objects = list(problem_objects)
+    if len(problem_objects) >= VECTORIZE_MIN_PROBLEMS:
+        phrases = assemble_cms_phrases_vectorized(problem_objects)
+        lines.extend(f"{idx}. {phrase}" for idx, phrase in enumerate(phrases, start=1))
+        return "\n".join(lines)
     for idx, p in enumerate(problem_objects, start=1):
-        phrase = assemble_cms_phrase(
-            base_diagnosis=p.get("diagnosis", "unspecified"),
-            modifier=p.get("modifier", "unspecified"),
-            complication=p.get("complication", "unspecified"),
-            stage=p.get("stage", "unspecified"),
-            temporal=p.get("temporal", "unspecified"),
-            laterality=p.get("laterality", "unspecified"),
-            location=p.get("location", "unspecified"),
-            etiology=p.get("etiology", "unspecified"),
-            context=p.get("context", "unspecified"),
-            severity=p.get("severity", "unspecified"),
-            supporting_data=p.get("supporting_data", ""),
-        )
+        # Positional, in signature order, so repeated problems hit the cache.
+        args = tuple(p.get(field, "unspecified") for field in _PHRASE_FIELDS)
+        phrase = assemble_cms_phrase(*args, p.get("supporting_data", ""))
         lines.append(f"{idx}. {phrase}")
     return "\n".join(lines)
 
@@ -5,23 +5,97 @@ Offline CMS/ICD-10 language converter for Daily Progress Notes.
 Version: 1.0  —  Local-only, hallucination-proof
 """
 
+import functools
+import os
 import re
+from concurrent.futures import ProcessPoolExecutor
 import pandas as pd
-from rapidfuzz import process
+from rapidfuzz import fuzz, process
 
 # ---------------------------
-# LOAD ICD-10 TABLE (CSV)
+# LOAD ICD-10 TABLE (CSV / PARQUET)
 # ---------------------------
 # Download from CMS.gov (icd10cm_codes_2025.csv or similar)
 # Columns expected: Code, ShortDesc, LongDesc
+# The table is loaded on first use, not at import. After the first CSV
+# parse a Parquet sidecar is written (when pyarrow is available) and
+# preferred on later runs, since it loads much faster.
 
-try:
-    ICD10 = pd.read_csv("icd10cm_codes.csv", dtype=str)
-    ICD_LIST = ICD10["LongDesc"].tolist()
-except FileNotFoundError:
-    ICD10 = pd.DataFrame(columns=["Code", "ShortDesc", "LongDesc"])
-    ICD_LIST = []
-    print("⚠️ ICD-10 CSV not found. Mapping will use placeholder text.\n")
+ICD_CSV = "icd10cm_codes.csv"
+ICD_PARQUET = "icd10cm_codes.parquet"
+_ICD_COLUMNS = ["Code", "LongDesc"]
+
+
+def _write_parquet(df: pd.DataFrame, path: str) -> None:
+    # Written beside the target and renamed into place, so an interrupted
+    # run never leaves a truncated sidecar that looks fresh.
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        df.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def build_icd_parquet(csv_path: str = ICD_CSV, parquet_path: str = ICD_PARQUET) -> None:
+    """One-time conversion of the CMS ICD-10 CSV to Parquet."""
+    _write_parquet(pd.read_csv(csv_path, dtype=str), parquet_path)
+
+
+def _parquet_is_fresh() -> bool:
+    if not os.path.exists(ICD_PARQUET):
+        return False
+    # A CSV replaced after the sidecar was written makes the sidecar stale.
+    return not os.path.exists(ICD_CSV) or os.path.getmtime(ICD_PARQUET) >= os.path.getmtime(ICD_CSV)
+
+
+def _read_icd_table() -> pd.DataFrame:
+    if _parquet_is_fresh():
+        try:
+            return pd.read_parquet(ICD_PARQUET, columns=_ICD_COLUMNS)
+        except (ImportError, OSError, ValueError):
+            # No Parquet engine, or a damaged sidecar (pyarrow's ArrowInvalid
+            # is a ValueError): fall back to the CSV when there is one.
+            if not os.path.exists(ICD_CSV):
+                raise
+    icd = pd.read_csv(ICD_CSV, dtype=str, usecols=_ICD_COLUMNS)
+    try:
+        _write_parquet(icd, ICD_PARQUET)
+    except (ImportError, OSError):
+        pass  # no Parquet engine or read-only folder: keep using the CSV
+    return icd
+
+
+@functools.lru_cache(maxsize=None)
+def _load_icd():
+    """
+    Returns (CODE_BY_DESC, ICD_LIST, ICD_CODES), reading the table on the
+    first call only.
+    """
+    try:
+        icd = _read_icd_table()
+    except FileNotFoundError:
+        icd = pd.DataFrame(columns=_ICD_COLUMNS)
+        print("⚠️ ICD-10 CSV not found. Mapping will use placeholder text.\n")
+
+    # Description -> code index; the first code wins for duplicate descriptions.
+    icd = icd.drop_duplicates("LongDesc")
+    code_by_desc = dict(zip(icd["LongDesc"], icd["Code"]))
+    descs = list(code_by_desc)
+    codes = list(code_by_desc.values())  # parallel to descs
+    return code_by_desc, descs, codes
+
+
+def __getattr__(name):
+    # CODE_BY_DESC / ICD_LIST / ICD_CODES stay available as module attributes.
+    fields = ("CODE_BY_DESC", "ICD_LIST", "ICD_CODES")
+    if name in fields:
+        return _load_icd()[fields.index(name)]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+_ICD_SCORE_CUTOFF = 80
 
 # ---------------------------
 # COMMON ABBREVIATIONS MAP
@@ -40,77 +114,117 @@ ABBR_MAP = {
     "AFib": "Atrial fibrillation",
 }
 
+# Single-pass matcher for every abbreviation (case-sensitive, e.g. "AFib").
+_ABBR_RE = re.compile(r"\b(?:" + "|".join(map(re.escape, ABBR_MAP)) + r")\b")
+
 # ---------------------------
 # FUNCTIONS
 # ---------------------------
 
 def expand_abbreviations(text: str) -> str:
-    for k, v in ABBR_MAP.items():
-        text = re.sub(rf"\b{k}\b", v, text)
-    return text
+    # Cheaper than re.split() tokenizing, which builds a list entry per word.
+    return _ABBR_RE.sub(lambda m: ABBR_MAP[m[0]], text)
 
 
 from modifiers import detect_modifier
 
 
+_SUPPORT_RE = re.compile(r"Cr ?\d+\.\d+|WBC ?\d+|Hgb ?\d+|SpO2 ?\d+%|on [A-Za-z]+")
+# Every _SUPPORT_RE match contains one of these; most notes can skip the regex.
+_SUPPORT_MARKERS = ("Cr", "WBC", "Hgb", "SpO2", "on ")
+
+
 def extract_supporting(text: str) -> str:
     """Pull minimal objective data if present."""
-    support = re.findall(r"(Cr ?\d+\.\d+|WBC ?\d+|Hgb ?\d+|SpO2 ?\d+%|on [A-Za-z]+)", text)
+    if not any(m in text for m in _SUPPORT_MARKERS):
+        return "⚠️ No supporting data"
+    support = _SUPPORT_RE.findall(text)
     return ", ".join(support[:3]) if support else "⚠️ No supporting data"
 
 
+def _format_icd(term: str, index) -> str:
+    if index is None:
+        return f"{term} — ⚠️ unmapped"
+    _, descs, codes = _load_icd()
+    return f"{descs[index]} ({codes[index]})"
+
+
+@functools.lru_cache(maxsize=4096)
 def match_icd10(term: str) -> str:
-    """Fuzzy match to ICD-10 description."""
-    if not ICD_LIST:
+    """Fuzzy match to ICD-10 description (memoized per term)."""
+    descs = _load_icd()[1]
+    if not descs:
         return "⚠️ ICD-10 mapping unavailable"
-    match = process.extractOne(term, ICD_LIST, score_cutoff=80)
-    if match:
-        row = ICD10.loc[ICD10["LongDesc"] == match[0]]
-        code = row["Code"].iloc[0] if not row.empty else ""
-        return f"{match[0]} ({code})"
-    else:
-        return f"{term} — ⚠️ unmapped"
+    # Raw strings on both sides (processor=None), as extractOne compares by
+    # default: case-folding here maps unrelated terms onto common codes.
+    match = process.extractOne(
+        term,
+        descs,
+        scorer=fuzz.WRatio,
+        processor=None,
+        score_cutoff=_ICD_SCORE_CUTOFF,
+    )
+    return _format_icd(term, match[2] if match else None)
+
+
+_DX_TERMS = sorted(set(ABBR_MAP.values()) | {
+    "Type 2 diabetes mellitus",
+    "Type 1 diabetes mellitus",
+    "Hypertension",
+    "Acute kidney injury",
+    "Chronic kidney disease",
+    "Congestive heart failure",
+    "Chronic obstructive pulmonary disease",
+    "Pneumonia",
+    "Anemia",
+    "Depression",
+    "Anxiety",
+    "Coronary artery disease",
+    "Atrial fibrillation",
+})
+# Longest first so a term is never cut short by a shorter alternative.
+_DX_ORDER = sorted(_DX_TERMS, key=len, reverse=True)
+# One group per term: IGNORECASE also matches "ſ", "ı" and "İ", which
+# lower() doesn't map back, so the term comes from the group that matched.
+_DX_RE = re.compile(
+    r"\b(?:" + "|".join(f"({re.escape(p)})" for p in _DX_ORDER) + r")\b",
+    re.IGNORECASE,
+)
 
 
 def extract_diagnoses(text: str) -> list[str]:
     """Identify diagnostic statements."""
-    patterns = list(ABBR_MAP.values()) + [
-        "Type 2 diabetes mellitus",
-        "Type 1 diabetes mellitus",
-        "Hypertension",
-        "Acute kidney injury",
-        "Chronic kidney disease",
-        "Congestive heart failure",
-        "Chronic obstructive pulmonary disease",
-        "Pneumonia",
-        "Anemia",
-        "Depression",
-        "Anxiety",
-        "Coronary artery disease",
-        "Atrial fibrillation",
-    ]
-    diagnoses = []
-    for p in patterns:
-        if re.search(rf"\b{re.escape(p)}\b", text, re.I):
-            diagnoses.append(p)
-    return list(set(diagnoses)) or ["⚠️ No clear diagnoses found"]
+    hits = {_DX_ORDER[m.lastindex - 1] for m in _DX_RE.finditer(text)}
+    return sorted(hits) or ["⚠️ No clear diagnoses found"]
 
 
 def cmsify(note_text: str) -> str:
     """Generate CMS-style output."""
     text = expand_abbreviations(note_text)
+    # Both depend only on the note, not on the individual diagnosis.
+    mod = detect_modifier(text)
+    support = extract_supporting(note_text)
     diagnoses = extract_diagnoses(text)
-    output_lines = []
-    for d in diagnoses:
-        mod = detect_modifier(text)
-        icd = match_icd10(f"{mod} {d}")
-        support = extract_supporting(note_text)
-        output_lines.append(f"{d}, {mod} — {support}.  {icd}")
+    icds = [match_icd10(f"{mod} {d}") for d in diagnoses]
+    output_lines = [f"{d}, {mod} — {support}.  {icd}" for d, icd in zip(diagnoses, icds)]
     return "# CMS-Ready Problem List\n" + "\n".join(
         f"{i+1}. {line}" for i, line in enumerate(output_lines)
     )
 
 
+def cmsify_batch(notes: list[str], workers: int | None = None) -> list[str]:
+    """Run cmsify() over many notes in parallel worker processes."""
+    notes = list(notes)
+    if not notes:
+        return []
+    # Load before forking so workers inherit the table instead of re-reading it.
+    _load_icd()
+    n_workers = workers or os.cpu_count() or 1
+    chunksize = max(1, len(notes) // (4 * n_workers))
+    with ProcessPoolExecutor(max_workers=n_workers) as ex:
+        return list(ex.map(cmsify, notes, chunksize=chunksize))
+
+
 # ---------------------------
 # MAIN EXECUTION
 # ---------------------------
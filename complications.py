@@ -12,7 +12,7 @@ manifestations, or systemic involvement, e.g.:
 Version: 1.0
 """
 
-import re
+from pattern_engine import PriorityMatcher, memoize_short
 
 # ---------------------------------------------------------------------
 # COMPLICATION PATTERN DICTIONARY
@@ -156,6 +156,16 @@ COMPLICATION_PRIORITY = [
     "without_complication",
 ]
 
+# Key -> display label, built once instead of per call.
+COMPLICATION_LABELS = {key: key.replace("_", " ") for key in COMPLICATION_PRIORITY}
+
+# ---------------------------------------------------------------------
+# COMPILED PATTERNS
+# ---------------------------------------------------------------------
+_COMPLICATION_MATCHER = PriorityMatcher(COMPLICATION_PATTERNS, COMPLICATION_PRIORITY)
+# Memoized for short inputs; problem fragments recur across notes.
+_search_complication = memoize_short(_COMPLICATION_MATCHER.search)
+
 # ---------------------------------------------------------------------
 # DETECTION FUNCTION
 # ---------------------------------------------------------------------
@@ -165,13 +175,16 @@ def detect_complication(text: str) -> str:
     Scans input text and returns a complication label string.
     Returns 'unspecified' if none detected.
     """
-    text = text.lower()
-    for key in COMPLICATION_PRIORITY:
-        for pattern in COMPLICATION_PATTERNS[key]:
-            if re.search(pattern, text):
-                # Pretty-format output
-                return key.replace("_", " ")
-    return "unspecified"
+    key = _search_complication(text)
+    return COMPLICATION_LABELS[key] if key else "unspecified"
+
+
+def detect_complication_batch(texts: list) -> list:
+    """detect_complication() over many texts using the batched matcher."""
+    return [
+        COMPLICATION_LABELS[key] if key else "unspecified"
+        for key in _COMPLICATION_MATCHER.search_many(texts)
+    ]
 
 # ---------------------------------------------------------------------
 # TEST HARNESS
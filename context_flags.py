@@ -7,7 +7,7 @@ suspected, probable, ruled out, denied, unclear, etc.
 Used to flag diagnostic certainty for CMS-compliant phrasing.
 """
 
-import re
+from pattern_engine import PriorityMatcher, memoize_short
 
 CONTEXT_PATTERNS = {
     # --- Uncertainty / Probability ---
@@ -93,6 +93,10 @@ CONTEXT_PRIORITY = [
     "secondary_condition",
 ]
 
+_CONTEXT_MATCHER = PriorityMatcher(CONTEXT_PATTERNS, CONTEXT_PRIORITY)
+# Certainty phrases repeat heavily between notes; whole notes skip the cache.
+_search_context = memoize_short(_CONTEXT_MATCHER.search)
+
 
 def detect_context(text: str) -> str:
     """
@@ -100,12 +104,12 @@ def detect_context(text: str) -> str:
     Returns one of: confirmed, possible, ruled_out, pending,
     differential, insufficient_data, historical, or unspecified.
     """
-    text = text.lower()
-    for key in CONTEXT_PRIORITY:
-        for pattern in CONTEXT_PATTERNS[key]:
-            if re.search(pattern, text):
-                return key
-    return "unspecified"
+    return _search_context(text) or "unspecified"
+
+
+def detect_context_batch(texts: list) -> list:
+    """detect_context() over many texts using the batched matcher."""
+    return [key or "unspecified" for key in _CONTEXT_MATCHER.search_many(texts)]
 
 
 if __name__ == "__main__":
@@ -9,7 +9,7 @@ including “due to,” “secondary to,” “iatrogenic,” “alcohol-related
 Version: 1.0
 """
 
-import re
+from pattern_engine import PriorityMatcher, memoize_short
 
 ETIOLOGY_PATTERNS = {
     # General causal phrases
@@ -151,17 +151,29 @@ ETIOLOGY_PRIORITY = [
     "idiopathic",
 ]
 
+# Labels as returned to callers ("secondary to", "drug induced", ...).
+ETIOLOGY_LABELS = {key: key.replace("_", " ") for key in ETIOLOGY_PRIORITY}
+
+_ETIOLOGY_MATCHER = PriorityMatcher(ETIOLOGY_PATTERNS, ETIOLOGY_PRIORITY)
+# Repeated fragments (e.g. "secondary to aspiration") skip matching.
+_search_etiology = memoize_short(_ETIOLOGY_MATCHER.search)
+
+
 def detect_etiology(text: str) -> str:
     """
     Scans text for etiologic or contextual qualifiers.
     Returns the most specific label, or 'unspecified' if none found.
     """
-    text = text.lower()
-    for key in ETIOLOGY_PRIORITY:
-        for pattern in ETIOLOGY_PATTERNS[key]:
-            if re.search(pattern, text):
-                return key.replace("_", " ")
-    return "unspecified"
+    key = _search_etiology(text)
+    return ETIOLOGY_LABELS[key] if key else "unspecified"
+
+
+def detect_etiology_batch(texts: list) -> list:
+    """detect_etiology() over many texts using the batched matcher."""
+    return [
+        ETIOLOGY_LABELS[key] if key else "unspecified"
+        for key in _ETIOLOGY_MATCHER.search_many(texts)
+    ]
 
 
 if __name__ == "__main__":
@@ -7,7 +7,7 @@ location/site references from clinical text to enhance
 diagnostic specificity.
 """
 
-import re
+from pattern_engine import PriorityMatcher
 
 LATERALITY_PATTERNS = {
     "right": [
@@ -169,17 +169,23 @@ LOCATION_PRIORITY = [
     "musculoskeletal",
 ]
 
+# Location keys with underscores spelled out, for detect_location().
+LOCATION_LABELS = {key: key.replace("_", " ") for key in LOCATION_PRIORITY}
+
+_LATERALITY_MATCHER = PriorityMatcher(LATERALITY_PATTERNS, LATERALITY_PRIORITY)
+_LOCATION_MATCHER = PriorityMatcher(LOCATION_PATTERNS, LOCATION_PRIORITY)
+
 def detect_laterality(text: str) -> str:
     """
     Detects laterality markers in text.
     Returns 'unspecified' if none found.
     """
-    text = text.lower()
-    for key in LATERALITY_PRIORITY:
-        for pattern in LATERALITY_PATTERNS[key]:
-            if re.search(pattern, text):
-                return key
-    return "unspecified"
+    return _LATERALITY_MATCHER.search(text) or "unspecified"
+
+
+def detect_laterality_batch(texts: list) -> list:
+    """detect_laterality() over many texts using the batched matcher."""
+    return [key or "unspecified" for key in _LATERALITY_MATCHER.search_many(texts)]
 
 
 def detect_location(text: str) -> str:
@@ -187,12 +193,16 @@ def detect_location(text: str) -> str:
     Detects anatomical site/location terms.
     Returns 'unspecified' if none found.
     """
-    text = text.lower()
-    for key in LOCATION_PRIORITY:
-        for pattern in LOCATION_PATTERNS[key]:
-            if re.search(pattern, text):
-                return key.replace("_", " ")
-    return "unspecified"
+    key = _LOCATION_MATCHER.search(text)
+    return LOCATION_LABELS[key] if key else "unspecified"
+
+
+def detect_location_batch(texts: list) -> list:
+    """detect_location() over many texts using the batched matcher."""
+    return [
+        LOCATION_LABELS[key] if key else "unspecified"
+        for key in _LOCATION_MATCHER.search_many(texts)
+    ]
 
 
 if __name__ == "__main__":
@@ -9,7 +9,7 @@ from clinical text phrases.
 Version: 1.0
 """
 
-import re
+from pattern_engine import PriorityMatcher, memoize_short, scan_head
 
 # Each category below defines regex patterns that signal a CMS-relevant modifier.
 
@@ -106,21 +106,30 @@ MODIFIER_PRIORITY = [
     "unspecified",
 ]
 
+# Compiled once at import: one fused regex per category, in priority order.
+_MODIFIER_MATCHER = PriorityMatcher(MODIFIER_PATTERNS, MODIFIER_PRIORITY)
+# Memoized: short fragments like "hx of COPD, stable" recur across notes.
+_search_modifier = memoize_short(_MODIFIER_MATCHER.search)
+
 # ---------------------------
 # DETECTION FUNCTION
 # ---------------------------
 
-def detect_modifier(text: str) -> str:
+def detect_modifier(text, scan_window: int | None = 256) -> str:
     """
-    Scans input text and returns the highest-priority modifier label.
+    Scans input text (a string or ParsedNote) and returns the
+    highest-priority modifier label.
+    Only the first `scan_window` characters are searched, where the
+    problem line sits; pass scan_window=None to scan the whole note.
     Returns 'unspecified' if nothing matches.
     """
-    text = text.lower()
-    for key in MODIFIER_PRIORITY:
-        for pattern in MODIFIER_PATTERNS[key]:
-            if re.search(pattern, text):
-                return key
-    return "unspecified"
+    return _search_modifier(scan_head(text, scan_window)) or "unspecified"
+
+
+def detect_modifier_batch(texts: list, scan_window: int | None = 256) -> list:
+    """detect_modifier() over many texts using the batched matcher."""
+    texts = [scan_head(t, scan_window) for t in texts]
+    return [key or "unspecified" for key in _MODIFIER_MATCHER.search_many(texts)]
 
 
 # ---------------------------
@@ -140,3 +149,10 @@ if __name__ == "__main__":
 
     for t in test_cases:
         print(f"{t:<60} → {detect_modifier(t)}")
+
+    # Words straddling the 256-character scan window are dropped, not cut
+    # short into another keyword ("newly" -> "new"): both stay unspecified.
+    for word in ("newly diagnosed", "chronically", "stableness"):
+        t = "." * 253 + word
+        print(f"{'(window cut) ' + word:<60} → {detect_modifier(t)}"
+              f" (full scan: {detect_modifier(t, scan_window=None)})")
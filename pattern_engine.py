@@ -0,0 +1,711 @@
+#!/usr/bin/env python3
+"""
+pattern_engine.py
+----------------------------------------------------------
+Shared matching engine for the CMSifier detector libraries.
+Compiles a PATTERNS dictionary and its PRIORITY list once at
+import (Hyperscan databases on first use) and answers "which
+is the highest-priority category with any matching pattern?"
+for a piece of clinical text.
+
+Optional accelerators, used when installed:
+    - hyperscan:      all patterns in a single multi-pattern scan
+    - pyahocorasick:  literal keywords in a single automaton pass
+    - numba:          parallel literal-keyword kernel for search_many()
+    - re2:            linear-time DFA searches for ASCII text
+    - pcre2:          JIT-compiled per-category regexes for ASCII text
+Otherwise the standard-library `re` engine is used.
+"""
+
+import functools
+import re
+import threading
+from dataclasses import dataclass
+
+try:
+    import hyperscan
+except ImportError:  # optional accelerator
+    hyperscan = None
+
+try:
+    import ahocorasick
+except ImportError:  # optional accelerator
+    ahocorasick = None
+
+# numba/numpy are imported on the first search_many(); see _numba_kernel().
+numba = np = None
+
+try:
+    import pcre2
+except ImportError:  # optional accelerator
+    pcre2 = None
+
+try:
+    import re2
+except ImportError:  # optional accelerator (google-re2)
+    re2 = None
+
+if re2 is not None:
+    _RE2_OPTIONS = re2.Options()
+    _RE2_OPTIONS.case_sensitive = False
+    _RE2_OPTIONS.log_errors = False
+
+# Hyperscan has no lookaround support; such patterns stay on `re`.
+_LOOKAROUND = re.compile(r"\(\?<?[=!]")
+
+# \b is ASCII-only outside UCP mode (which rejects \b), so Hyperscan
+# databases are only used for ASCII text; see PriorityMatcher.search().
+_HS_FLAGS = (
+    hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SINGLEMATCH if hyperscan is not None else 0
+)
+
+# A keyword the automaton can match with plain word-boundary checks.
+_KEYWORD = re.compile(r"[A-Za-z0-9](?:[A-Za-z0-9 /-]*[A-Za-z0-9])?")
+_KEYWORD_CHARS = frozenset("abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789 /-")
+# Patterns expanding to more keywords than this stay on the regex engine.
+_MAX_VARIANTS = 64
+
+_WORD = re.compile(r"\w+")
+
+
+@dataclass(frozen=True, slots=True)
+class ParsedNote:
+    """
+    A note prepared once for all detectors: the raw text, its lower-cased
+    copy and the set of lower-cased words. Every detector accepts either a
+    plain string or a ParsedNote.
+
+    The pipeline passes plain strings: building the word set costs more
+    than the lower() calls it saves.
+    """
+
+    raw: str
+    lower: str
+    words: frozenset
+
+    @classmethod
+    def parse(cls, text: str) -> "ParsedNote":
+        lower = text.lower()
+        return cls(raw=text, lower=lower, words=frozenset(_WORD.findall(lower)))
+
+
+def memoize_short(search, max_len: int = 128, maxsize: int = 8192):
+    """
+    Wraps a search function so that plain strings shorter than `max_len`
+    (problem-list phrases, which recur across patients) are answered from
+    an LRU cache. Longer text and ParsedNotes are searched directly, so
+    unique notes do not evict the phrases.
+    """
+    cached = functools.lru_cache(maxsize=maxsize)(search)
+
+    def wrapper(text):
+        if isinstance(text, str) and len(text) < max_len:
+            return cached(text)
+        return search(text)
+
+    wrapper.cache_info = cached.cache_info
+    wrapper.cache_clear = cached.cache_clear
+    return wrapper
+
+
+def scan_head(text, window):
+    """
+    The first `window` characters of a string or ParsedNote, for detectors
+    that only look at the lead of a note. None keeps the whole text. A word
+    running across the cut is dropped whole: cutting "newly" to "new" would
+    create a word boundary the note doesn't have.
+    """
+    raw = text.raw if isinstance(text, ParsedNote) else text
+    if window is None or len(raw) <= window:
+        return text
+    end = window
+    while end > 0 and _is_word_char(raw[end - 1]) and _is_word_char(raw[end]):
+        end -= 1
+    return ParsedNote.parse(raw[:end]) if isinstance(text, ParsedNote) else raw[:end]
+
+
+def _compile(pattern: str):
+    """
+    Case-insensitive regex with a .search() method, for ASCII text only:
+    PCRE2 with JIT when available, otherwise (or for patterns PCRE2
+    rejects) `re` in ASCII mode.
+    """
+    if pcre2 is not None:
+        try:
+            rx = pcre2.compile(pattern, flags=pcre2.IGNORECASE | pcre2.UNICODE)
+            rx.jit_compile()
+            return rx
+        except pcre2.LibraryError:
+            pass
+    return re.compile(pattern, re.IGNORECASE | re.ASCII)
+
+
+class _AsciiRegex:
+    """
+    `rx` (RE2, PCRE2 or `re` in ASCII mode) for ASCII text, where ASCII-only
+    word boundaries and classes agree with Unicode ones; `fallback` (all
+    patterns, on `re`) for the rest. `extra` holds the patterns RE2
+    rejects, checked after a miss.
+    """
+
+    __slots__ = ("_rx", "_extra", "_fallback")
+
+    def __init__(self, rx, extra, fallback):
+        self._rx = rx
+        self._extra = extra
+        self._fallback = fallback
+
+    def search(self, text: str):
+        if not text.isascii():
+            return self._fallback.search(text)
+        hit = self._rx.search(text)
+        if hit is None and self._extra is not None:
+            hit = self._extra.search(text)
+        return hit
+
+
+def _union(patterns: list) -> str:
+    return "|".join(f"(?:{p})" for p in patterns)
+
+
+def _compile_any(patterns: list):
+    """
+    A regex whose .search() hits wherever any of `patterns` does. ASCII
+    text runs on RE2 when installed; patterns it rejects (lookarounds)
+    fall back one by one rather than the whole group. Otherwise ASCII text
+    runs on _compile(): PCRE2, or `re` in ASCII mode, which skips Unicode
+    case folding. Other text always
+    runs on `re`, whose Unicode case folding the engines don't share
+    (PCRE2 doesn't fold "İ" to "i"), so labels don't depend on which
+    packages are installed.
+    """
+    union = _union(patterns)
+    fallback = re.compile(union, re.IGNORECASE)
+    plain = [p for p in patterns if not _LOOKAROUND.search(p)]
+    if re2 is not None and plain:
+        rest = [p for p in patterns if _LOOKAROUND.search(p)]
+        try:
+            rx = re2.compile(_union(plain), _RE2_OPTIONS)
+        except re2.error:
+            pass
+        else:
+            extra = _compile(_union(rest)) if rest else None
+            return _AsciiRegex(rx, extra, fallback)
+    return _AsciiRegex(_compile(union), None, fallback)
+
+
+def _hyperscan_compile(entries: list):
+    """Compile (id, pattern) pairs into a block-mode database reporting those ids."""
+    db = hyperscan.Database(mode=hyperscan.HS_MODE_BLOCK)
+    db.compile(
+        expressions=[p.encode("ascii") for _, p in entries],
+        ids=[i for i, _ in entries],
+        elements=len(entries),
+        flags=[_HS_FLAGS] * len(entries),
+    )
+    return db
+
+
+def _hyperscan_scan(db, local: threading.local, data: bytes, on_match) -> None:
+    # The database's own scratch space is single-threaded: concurrent scans
+    # raise ScratchInUseError, so each thread scans with a scratch of its own.
+    scratch = getattr(local, "scratch", None)
+    if scratch is None:
+        scratch = local.scratch = hyperscan.Scratch(db)
+    db.scan(data, match_event_handler=on_match, scratch=scratch)
+
+
+def _hyperscan_supports(pattern: str) -> bool:
+    try:
+        _hyperscan_compile([(0, pattern)])
+    except hyperscan.error:
+        return False
+    return True
+
+
+def _is_word_char(ch: str) -> bool:
+    # Same definition `re` uses for \w on str patterns.
+    return ch.isalnum() or ch == "_"
+
+
+def _lower_agrees(text: str, lower: str) -> bool:
+    """
+    Whether keyword tests on `lower` find what IGNORECASE regexes find in
+    `text`. Case mapping that changes length would misalign boundary
+    checks, and `re` also folds "ı" and "ſ" to "i" and "s", which lower()
+    leaves alone.
+    """
+    if text.isascii():
+        return True
+    return len(lower) == len(text) and "ı" not in text and "ſ" not in text
+
+
+def _required_literals(pattern: str):
+    """
+    Returns lower-cased literals such that every match of `pattern` contains
+    at least one of them (one per top-level branch), or None if some branch
+    has no mandatory literal text.
+    """
+    branches, runs, cur, depth, i = [], [], "", 0, 0
+    while i < len(pattern):
+        ch = pattern[i]
+        if ch == "\\":
+            nxt = pattern[i + 1 : i + 2]
+            if depth == 0:
+                if nxt.isalnum():  # \b, \d, \s, ... end the literal run
+                    runs.append(cur)
+                    cur = ""
+                else:
+                    cur += nxt
+            i += 2
+            continue
+        if ch == "[":
+            i = pattern.index("]", i + 2) + 1
+            if depth == 0:
+                runs.append(cur)
+                cur = ""
+            continue
+        if depth == 0:
+            if ch in "?*{":
+                # The preceding character (or group) may be absent.
+                runs.append(cur[:-1])
+                cur = ""
+                if ch == "{":
+                    i = pattern.index("}", i)
+            elif ch in "(+.^$":
+                runs.append(cur)
+                cur = ""
+            elif ch == "|":
+                branches.append(runs + [cur])
+                runs, cur = [], ""
+            else:
+                cur += ch
+        if ch == "(":
+            depth += 1
+        elif ch == ")":
+            depth -= 1
+        i += 1
+    branches.append(runs + [cur])
+    literals = [max(b, key=len).lower() for b in branches]
+    return None if not all(literals) else literals
+
+
+def _keyword_variants(pattern: str):
+    """
+    Expands a word-bounded pattern made only of literal text, groups of
+    literal alternatives and small character classes (each optionally
+    followed by ?) into the keywords it matches, e.g.
+    r"\bimprov(ing|ed)\b" -> ["improving", "improved"]. None otherwise.
+    """
+    if not (pattern.startswith(r"\b") and pattern.endswith(r"\b")):
+        return None
+    body, variants, i = pattern[2:-2], [""], 0
+    while i < len(body):
+        ch = body[i]
+        if ch == "(":
+            end = body.find(")", i)
+            inner = body[i + 1 : end]
+            choices = (inner[2:] if inner.startswith("?:") else inner).split("|")
+        elif ch == "[":
+            end = body.find("]", i)
+            choices = list(body[i + 1 : end])
+            if "-" in choices[1:-1]:  # a range such as [A-C]
+                return None
+        else:
+            end, choices = i, [ch]
+        if end < 0 or not all(_KEYWORD_CHARS.issuperset(c) for c in choices):
+            return None
+        i = end + 1
+        if body[i : i + 1] == "?":
+            choices.append("")
+            i += 1
+        variants = [v + c for v in variants for c in choices]
+        if len(variants) > _MAX_VARIANTS:
+            return None
+    if not all(_KEYWORD.fullmatch(v) for v in variants):
+        return None
+    return variants
+
+
+def _split_literals(patterns: dict, priority: list):
+    """
+    Separates patterns that expand to word-bounded keywords from true
+    regex patterns.
+    Returns ({keyword: best rank}, [[compiled regex, ...] per rank]).
+    """
+    keywords, regexes = {}, [[] for _ in priority]
+    for rank, key in enumerate(priority):
+        for p in patterns[key]:
+            variants = _keyword_variants(p)
+            if variants:
+                for kw in map(str.lower, variants):
+                    # A keyword shared by several categories keeps the best rank.
+                    keywords[kw] = min(rank, keywords.get(kw, rank))
+            else:
+                regexes[rank].append(_compile_any([p]))
+    return keywords, regexes
+
+
+def _prune_seeds(seeds: set) -> tuple:
+    # A seed containing a shorter seed adds nothing to an "any of" test.
+    return tuple(sorted(s for s in seeds if not any(o != s and o in s for o in seeds)))
+
+
+def _tier_seeds(patterns: dict, priority: list) -> list:
+    """
+    Per rank, lower-cased literals at least one of which occurs in any text
+    a pattern of that rank matches, so the rank can be skipped for texts
+    without them. None for a rank with a pattern that has no usable literal.
+    """
+    # A required-characters bitmap per rank rules out far fewer tiers than
+    # these seeds and costs more to build than it saves.
+    tiers = []
+    for key in priority:
+        seeds = set()
+        for p in patterns[key]:
+            literals = _required_literals(p)
+            if literals is None or min(map(len, literals)) < 2:
+                seeds = None
+                break
+            seeds.update(literals)
+        tiers.append(None if seeds is None else _prune_seeds(seeds))
+    return tiers
+
+
+def _nb_is_word_char(ch):
+    return ch.isalnum() or ch == "_"
+
+
+def _nb_literal_ranks(texts, keywords, ranks, miss):
+    # keywords are sorted by rank, so a text stops at its first hit.
+    out = np.full(len(texts), miss, np.int64)
+    for i in numba.prange(len(texts)):
+        text = texts[np.int64(i)]
+        for j in range(len(keywords)):
+            kw = keywords[j]
+            start = text.find(kw)
+            while start >= 0:
+                end = start + len(kw)
+                if (start == 0 or not _nb_is_word_char(text[start - 1])) and (
+                    end == len(text) or not _nb_is_word_char(text[end])
+                ):
+                    break
+                start = text.find(kw, start + 1)
+            if start >= 0:
+                out[i] = ranks[j]
+                break
+    return out
+
+
+@functools.lru_cache(maxsize=None)
+def _numba_kernel():
+    """
+    The jitted _nb_literal_ranks, or None without numba. Deferred to the
+    first batch: importing numba takes about a second, which every
+    single-note CLI run would otherwise pay at import.
+    """
+    global numba, np, _nb_is_word_char, _nb_literal_ranks
+    try:
+        import numba as _numba
+        import numpy as _np
+    except ImportError:  # optional accelerator
+        return None
+    numba, np = _numba, _np
+    # Rebound at module level so the kernel's global lookups (and numba's
+    # on-disk cache) see the compiled helpers.
+    _nb_is_word_char = numba.njit(cache=True)(_nb_is_word_char)
+    _nb_literal_ranks = numba.njit(parallel=True, cache=True)(_nb_literal_ranks)
+    return _nb_literal_ranks
+
+
+class PriorityMatcher:
+    """
+    Compiled form of one PATTERNS/PRIORITY pair.
+    search() returns the highest-priority key with a matching pattern,
+    or None if nothing matches.
+
+    Each category is one regex, tried in priority order and skipped when
+    the text lacks its seed literals. With Hyperscan (or pyahocorasick,
+    for the keyword patterns) one pass finds the best candidate instead,
+    and only the higher-priority patterns it doesn't cover are re-checked.
+    """
+
+    def __init__(self, patterns: dict, priority: list):
+        self.priority = [key for key in priority if patterns.get(key)]
+
+        # One alternation per category, tried in priority order: the first
+        # category whose regex matches anywhere in the text wins.
+        self._tiers = [
+            _compile_any(patterns[key]) for key in self.priority
+        ]
+
+        self._keywords, self._regexes = _split_literals(patterns, self.priority)
+        self._tier_seeds = _tier_seeds(patterns, self.priority)
+        # Seeds of the whole matcher. `in` tests on a lower-cased copy only
+        # agree with IGNORECASE for ASCII text; other text gets a regex.
+        self._seeds = self._seed = self._seed_re2 = None
+        if all(seeds is not None for seeds in self._tier_seeds):
+            self._seeds = _prune_seeds(set().union(*self._tier_seeds))
+            seed_union = "|".join(map(re.escape, self._seeds))
+            self._seed = re.compile(seed_union, re.IGNORECASE)
+            # One DFA pass beats dozens of `in` scans over the same text.
+            if re2 is not None:
+                self._seed_re2 = re2.compile(seed_union, _RE2_OPTIONS)
+        # Any keyword hit implies its first word is among a ParsedNote's words.
+        self._keyword_words = frozenset(_WORD.match(kw).group() for kw in self._keywords)
+
+        # Patterns the active accelerator does not cover, per rank.
+        self._residual = [[] for _ in self.priority]
+        self._hs_db = None
+        self._hs_local = threading.local()
+        self._automaton = None
+        # The Hyperscan database is compiled by the first search(): building
+        # all of them at import takes most of a second, which every
+        # single-note CLI run would otherwise pay.
+        self._hs_patterns = patterns if hyperscan is not None else None
+        self._hs_lock = threading.Lock()
+        if hyperscan is None and ahocorasick is not None:
+            self._build_automaton()
+
+        # Typed keyword lists for the numba kernel, built by the first batch.
+        self._nb_keywords = self._nb_ranks = None
+
+    def _hyperscan_db(self):
+        """The Hyperscan database, compiled on first use; None without one."""
+        if self._hs_patterns is not None:
+            with self._hs_lock:
+                if self._hs_patterns is not None:
+                    self._build_hyperscan(self._hs_patterns)
+                    self._hs_patterns = None
+        return self._hs_db
+
+    def _build_hyperscan(self, patterns: dict):
+        entries = [
+            (rank, p) for rank, key in enumerate(self.priority) for p in patterns[key]
+        ]
+        usable = [e for e in entries if e[1].isascii() and not _LOOKAROUND.search(e[1])]
+        try:
+            db = _hyperscan_compile(usable)
+        except hyperscan.error:
+            # Only probe patterns one by one when the bulk compile fails.
+            usable = [e for e in usable if _hyperscan_supports(e[1])]
+            db = _hyperscan_compile(usable) if usable else None
+        # (rank, pattern) pairs in the database, reused by MultiMatcher.
+        self._hs_entries = usable
+        covered = set(usable)
+        residual = [[] for _ in self.priority]
+        for rank, p in entries:
+            if (rank, p) not in covered:
+                residual[rank].append(_compile_any([p]))
+        self._residual = residual
+        self._hs_db = db
+
+    def _build_automaton(self):
+        self._residual = self._regexes
+        if not self._keywords:
+            return
+        automaton = ahocorasick.Automaton()
+        for kw, rank in self._keywords.items():
+            automaton.add_word(kw, (len(kw), rank))
+        automaton.make_automaton()
+        self._automaton = automaton
+
+    def search(self, text):
+        """Accepts a plain string or a ParsedNote."""
+        if isinstance(text, ParsedNote):
+            text, lower, words = text.raw, text.lower, text.words
+        else:
+            lower = words = None
+        if text.isascii() and self._hyperscan_db() is not None:
+            return self._resolve(self._best_hyperscan(text), text)
+        if text.isascii():
+            lower = text.lower() if lower is None else lower
+        if self._lacks_seeds(text, lower):
+            return None
+        ascii_lower = lower if text.isascii() else None
+        if self._automaton is not None and lower is None:
+            lower = text.lower()
+        if lower is not None and _lower_agrees(text, lower):
+            if (
+                words is not None
+                and self._keywords
+                and text.isascii()
+                and words.isdisjoint(self._keyword_words)
+            ):
+                # No keyword can occur; only the regex patterns are left.
+                # Non-ASCII words can match a keyword only under case
+                # folding ("ſudden" for "sudden"), which the word set misses.
+                return self._resolve(len(self.priority), text, self._regexes, ascii_lower)
+            if self._automaton is not None:
+                return self._resolve(self._best_automaton(lower), text, lower=ascii_lower)
+        # Without the automaton, the per-category regexes in priority order.
+        for rank, rx in enumerate(self._tiers):
+            if not self._skips_tier(rank, ascii_lower) and rx.search(text):
+                return self.priority[rank]
+        return None
+
+    def search_many(self, texts) -> list:
+        """search() over a batch; uses the numba literal kernel when available."""
+        texts = list(texts)
+        kernel = _numba_kernel() if self._hyperscan_db() is None and self._keywords and texts else None
+        if kernel is None:
+            return [self.search(t) for t in texts]
+        if self._nb_keywords is None:
+            ordered = sorted(self._keywords.items(), key=lambda kv: kv[1])
+            self._nb_keywords = numba.typed.List([kw for kw, _ in ordered])
+            self._nb_ranks = np.array([rank for _, rank in ordered], dtype=np.int64)
+        notes = [t if isinstance(t, ParsedNote) else None for t in texts]
+        texts = [t.raw if n is not None else t for t, n in zip(texts, notes)]
+        lowers = [n.lower if n is not None else t.lower() for t, n in zip(texts, notes)]
+        best = kernel(
+            numba.typed.List(lowers), self._nb_keywords, self._nb_ranks, len(self.priority)
+        )
+        results = []
+        for text, lower, rank in zip(texts, lowers, best):
+            if self._lacks_seeds(text, lower):
+                results.append(None)
+            elif not _lower_agrees(text, lower):
+                results.append(self.search(text))
+            else:
+                ascii_lower = lower if text.isascii() else None
+                results.append(self._resolve(int(rank), text, self._regexes, ascii_lower))
+        return results
+
+    def _lacks_seeds(self, text: str, lower) -> bool:
+        # ASCII text: one RE2 pass, or plain substring tests without RE2.
+        # Anything else goes through the Unicode-aware seed regex.
+        if self._seeds is None:
+            return False
+        if not text.isascii():
+            return not self._seed.search(text)
+        if self._seed_re2 is not None:
+            return self._seed_re2.search(text) is None
+        return not any(s in lower for s in self._seeds)
+
+    def _skips_tier(self, rank: int, ascii_lower) -> bool:
+        seeds = self._tier_seeds[rank]
+        return (
+            ascii_lower is not None
+            and seeds is not None
+            and not any(s in ascii_lower for s in seeds)
+        )
+
+    def _best_hyperscan(self, text: str) -> int:
+        hits = []
+
+        def on_match(rank, start, end, flags, context):
+            hits.append(rank)
+
+        _hyperscan_scan(self._hs_db, self._hs_local, text.encode("ascii"), on_match)
+        return min(hits, default=len(self.priority))
+
+    def _best_automaton(self, lower: str) -> int:
+        best = len(self.priority)
+        last = len(lower) - 1
+        for end, (length, rank) in self._automaton.iter(lower):
+            if rank >= best:
+                continue
+            start = end - length + 1
+            if start > 0 and _is_word_char(lower[start - 1]):
+                continue
+            if end < last and _is_word_char(lower[end + 1]):
+                continue
+            best = rank
+            if rank == 0:
+                break
+        return best
+
+    def _resolve(self, best: int, text: str, residual=None, lower=None):
+        # Only higher-priority residual patterns can still change the answer.
+        # `lower` is the lower-cased text when ASCII, for the tier seed check.
+        residual = self._residual if residual is None else residual
+        for rank in range(best):
+            if not residual[rank] or self._skips_tier(rank, lower):
+                continue
+            if any(rx.search(text) for rx in residual[rank]):
+                return self.priority[rank]
+        return self.priority[best] if best < len(self.priority) else None
+
+
+class MultiMatcher:
+    """
+    Several PriorityMatchers answered together. With Hyperscan, search()
+    scans ASCII text once against one database holding every matcher's
+    patterns; with only pyahocorasick, one automaton holds every matcher's
+    keywords. Otherwise it runs each matcher's own search(). Returns one
+    key (or None) per matcher, in order.
+    """
+
+    def __init__(self, matchers):
+        self.matchers = list(matchers)
+        self._hs_db = None
+        self._hs_local = threading.local()
+        # Like PriorityMatcher, the database is compiled by the first search().
+        self._hs_pending = hyperscan is not None
+        self._hs_lock = threading.Lock()
+        self._automaton = None
+        if hyperscan is None and self.matchers and all(m._automaton is not None for m in self.matchers):
+            automaton = ahocorasick.Automaton()
+            # A keyword shared by two matchers keeps both (slot, rank) tags.
+            tags = {}
+            for slot, m in enumerate(self.matchers):
+                for kw, rank in m._keywords.items():
+                    tags.setdefault(kw, []).append((slot, rank))
+            for kw, hits in tags.items():
+                automaton.add_word(kw, (len(kw), tuple(hits)))
+            automaton.make_automaton()
+            self._automaton = automaton
+
+    def _hyperscan_db(self):
+        """The shared Hyperscan database, compiled on first use; None without one."""
+        if self._hs_pending:
+            with self._hs_lock:
+                if self._hs_pending:
+                    self._build_hyperscan()
+                    self._hs_pending = False
+        return self._hs_db
+
+    def _build_hyperscan(self):
+        for m in self.matchers:
+            m._hyperscan_db()
+        # Hyperscan id -> (matcher index, rank).
+        self._ids = [
+            (slot, rank) for slot, m in enumerate(self.matchers) for rank, _ in m._hs_entries
+        ]
+        if self._ids:
+            patterns = [p for m in self.matchers for _, p in m._hs_entries]
+            self._hs_db = _hyperscan_compile(list(enumerate(patterns)))
+
+    def search(self, text) -> list:
+        raw = text.raw if isinstance(text, ParsedNote) else text
+        if not raw.isascii() or self._hyperscan_db() is None:
+            if self._automaton is not None:
+                lower = text.lower if isinstance(text, ParsedNote) else raw.lower()
+                if _lower_agrees(raw, lower):
+                    return self._search_automaton(raw, lower)
+            return [m.search(text) for m in self.matchers]
+        best = [len(m.priority) for m in self.matchers]
+
+        def on_match(pattern_id, start, end, flags, context):
+            slot, rank = self._ids[pattern_id]
+            if rank < best[slot]:
+                best[slot] = rank
+
+        _hyperscan_scan(self._hs_db, self._hs_local, raw.encode("ascii"), on_match)
+        # Each matcher's residual list holds exactly the patterns left out.
+        return [m._resolve(b, raw) for m, b in zip(self.matchers, best)]
+
+    def _search_automaton(self, raw: str, lower: str) -> list:
+        best = [len(m.priority) for m in self.matchers]
+        last = len(lower) - 1
+        for end, (length, hits) in self._automaton.iter(lower):
+            start = end - length + 1
+            if start > 0 and _is_word_char(lower[start - 1]):
+                continue
+            if end < last and _is_word_char(lower[end + 1]):
+                continue
+            for slot, rank in hits:
+                if rank < best[slot]:
+                    best[slot] = rank
+        ascii_lower = lower if raw.isascii() else None
+        return [m._resolve(b, raw, lower=ascii_lower) for m, b in zip(self.matchers, best)]
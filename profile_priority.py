@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+profile_priority.py
+----------------------------------------------------------
+Hit-rate profile of the modifier, staging and temporal priority
+lists over a corpus of notes (one note per line, from the files
+given or stdin).
+
+For every key it reports how often the key wins, how often its
+patterns match at all, and how often it matched but lost to a
+higher-priority key. A key that never co-occurs with the keys
+ahead of it could be moved without changing any output; a key
+that is shadowed cannot. The priority lists themselves are
+semantic and are not rewritten by this script.
+
+Usage: python profile_priority.py notes.txt [more.txt ...]
+"""
+
+import fileinput
+from collections import Counter
+
+from modifiers import _MODIFIER_MATCHER
+from severity_stage import _STAGING_MATCHER
+from temporal_status import _TEMPORAL_MATCHER
+
+MATCHERS = {
+    "MODIFIER_PRIORITY": _MODIFIER_MATCHER,
+    "STAGING_PRIORITY": _STAGING_MATCHER,
+    "TEMPORAL_PRIORITY": _TEMPORAL_MATCHER,
+}
+
+
+def profile(matcher, notes: list) -> list:
+    """Returns (key, wins, matches, shadowed) per key, in priority order."""
+    wins, matches, shadowed = Counter(), Counter(), Counter()
+    for note in notes:
+        hit = [rank for rank, rx in enumerate(matcher._tiers) if rx.search(note)]
+        if not hit:
+            continue
+        wins[hit[0]] += 1
+        matches.update(hit)
+        shadowed.update(hit[1:])
+    return [
+        (key, wins[rank], matches[rank], shadowed[rank])
+        for rank, key in enumerate(matcher.priority)
+    ]
+
+
+if __name__ == "__main__":
+    notes = [line.strip() for line in fileinput.input() if line.strip()]
+    print(f"\nPriority hit-rate profile over {len(notes)} notes\n" + "-" * 55)
+    for name, matcher in MATCHERS.items():
+        print(f"\n{name}:")
+        print(f"  {'key':<28}{'wins':>8}{'matches':>9}{'shadowed':>10}")
+        for key, won, matched, lost in profile(matcher, notes):
+            print(f"  {key:<28}{won:>8}{matched:>9}{lost:>10}")
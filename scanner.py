@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+scanner.py
+----------------------------------------------------------
+Everything the per-note pipeline needs in two passes over a
+note: modifier, stage/severity and temporal status in one
+(_hs.detect_all, a shared Hyperscan database or Aho-Corasick
+automaton), then the supporting-data summary (one position
+scan plus the per-pattern regexes in supporting_data_rules).
+
+detect_modifier, detect_stage_or_severity, detect_temporal_status
+and extract_supporting_data remain the per-module entry points.
+"""
+
+from _hs import detect_all
+from supporting_data_rules import extract_supporting_data
+
+
+def analyze(text: str, max_items: int = 4) -> dict:
+    """
+    Returns {"modifier", "stage", "temporal", "supporting"} for the text,
+    identical to calling the four module functions separately, with
+    modifier and temporal status taken over the whole text.
+    """
+    modifier, stage, temporal = detect_all(text)
+    return {
+        "modifier": modifier,
+        "stage": stage,
+        "temporal": temporal,
+        "supporting": extract_supporting_data(text, max_items),
+    }
+
+
+if __name__ == "__main__":
+    test_cases = [
+        "Acute on chronic systolic heart failure, NYHA class III, BNP 1200, worsening",
+        "CKD stage 3, Cr 2.1 (baseline 1.5), chronic stable",
+        "New onset atrial fibrillation, HR 142, on diltiazem drip",
+        "Hx of COPD, SpO2 88% on 2L, CXR shows hyperinflation",
+    ]
+
+    print("\nNote analysis test run:\n" + "-" * 55)
+    for t in test_cases:
+        print(f"{t}\n    → {analyze(t)}")
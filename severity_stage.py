@@ -8,7 +8,7 @@ Detects disease stage, severity, or class qualifiers
 Version: 1.0
 """
 
-import re
+from pattern_engine import PriorityMatcher, memoize_short
 
 # ---------------------------------------------------------------------
 # PATTERNS
@@ -17,14 +17,11 @@ import re
 STAGING_PATTERNS = {
     # --- Chronic Kidney Disease ---
     "ckd_stage": [
-        r"\bckd stage ?([1-5])\b",
-        r"\bchronic kidney disease stage ?([1-5])\b",
-        r"\bstage ?([1-5]) ?ckd\b",
+        r"\b(?:ckd|chronic kidney disease) stage ?[1-5]\b|\bstage ?[1-5] ?ckd\b",
     ],
     # --- Heart Failure NYHA Class ---
     "heart_failure_nyha": [
-        r"\bnyha class ?(i{1,4}|\d)\b",
-        r"\bclass ?(i{1,4}|\d) ?nyha\b",
+        r"\bnyha class ?(?:i{1,4}|\d)\b|\bclass ?(?:i{1,4}|\d) ?nyha\b",
     ],
     # --- COPD GOLD Stage ---
     "copd_gold": [
@@ -34,9 +31,7 @@ STAGING_PATTERNS = {
     # --- Cancer Staging ---
     "cancer_stage": [
         r"\bstage ?[I|V|X]+[ABCD]?\b",
-        r"\bT\d+[A-C]?\b",
-        r"\bN\d+[A-C]?\b",
-        r"\bM\d+[A-C]?\b",
+        r"\b(?-i:[TNM])\d+[A-C]?\b",  # upper-case only: not "m2" or "t3 vertebra"
     ],
     # --- Liver Disease ---
     "child_pugh": [
@@ -111,6 +106,14 @@ STAGING_PRIORITY = [
     "pain_severity",
 ]
 
+# Precomputed display labels; detectors return these shared strings.
+STAGING_LABELS = {key: key.replace("_", " ") for key in STAGING_PRIORITY}
+
+# Compiled once at import: one fused regex per category, in priority order.
+_STAGING_MATCHER = PriorityMatcher(STAGING_PATTERNS, STAGING_PRIORITY)
+# Cached for short inputs only: "CKD stage 3" recurs, whole notes do not.
+_search_staging = memoize_short(_STAGING_MATCHER.search)
+
 # ---------------------------------------------------------------------
 # DETECTION FUNCTION
 # ---------------------------------------------------------------------
@@ -120,12 +123,16 @@ def detect_stage_or_severity(text: str) -> str:
     Scans input text for stage, severity, or class indicators.
     Returns the best-matching label string or 'unspecified'.
     """
-    text = text.lower()
-    for key in STAGING_PRIORITY:
-        for pattern in STAGING_PATTERNS[key]:
-            if re.search(pattern, text):
-                return key.replace("_", " ")
-    return "unspecified"
+    key = _search_staging(text)
+    return STAGING_LABELS[key] if key else "unspecified"
+
+
+def detect_stage_or_severity_batch(texts: list) -> list:
+    """detect_stage_or_severity() over many texts using the batched matcher."""
+    return [
+        STAGING_LABELS[key] if key else "unspecified"
+        for key in _STAGING_MATCHER.search_many(texts)
+    ]
 
 # ---------------------------------------------------------------------
 # TEST HARNESS
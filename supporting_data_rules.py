@@ -20,9 +20,9 @@ LAB_PATTERNS = {
         r"\bBUN( ?=|:)? ?\d+\b",
     ],
     "electrolytes": [
-        r"\bNa( ?=|:)? ?\d+\b",
-        r"\bK( ?=|:)? ?\d+\b",
-        r"\bCl( ?=|:)? ?\d+\b",
+        r"\b(?-i:Na)( ?=|:)? ?\d+\b",  # as written: 'na' means not applicable
+        r"\b(?-i:K)( ?=|:)? ?\d+\b",  # upper-case only: 'k' means thousand
+        r"\b(?-i:Cl)( ?=|:)? ?\d+\b",  # as written: 'cl' means centiliter
         r"\bCO2( ?=|:)? ?\d+\b",
         r"\bbicarb( ?=|:)? ?\d+\b",
     ],
@@ -50,14 +50,14 @@ LAB_PATTERNS = {
     ],
     "coags": [
         r"\bINR( ?=|:)? ?\d+(\.\d+)?\b",
-        r"\bPT( ?=|:)? ?\d+\b",
+        r"\b(?-i:PT)( ?=|:)? ?\d+\b",  # upper-case only: 'pt' means patient
         r"\bPTT( ?=|:)? ?\d+\b",
     ],
 }
 
 VITAL_PATTERNS = {
     "temperature": [
-        r"\bT( ?=|:)? ?\d+(\.\d+)?( ?[CF])?\b",
+        r"\b(?-i:T)( ?=|:)? ?\d+(\.\d+)?( ?[CF])?\b",  # upper-case only: not 't3 vertebra'
         r"\btemp(erature)?( ?=|:)? ?\d+(\.\d+)?\b",
     ],
     "blood_pressure": [
@@ -65,7 +65,7 @@ VITAL_PATTERNS = {
         r"\bblood pressure\b",
     ],
     "heart_rate": [
-        r"\bHR( ?=|:)? ?\d+\b",
+        r"\b(?-i:HR)( ?=|:)? ?\d+\b",  # upper-case only: 'hr' means hours
         r"\bpulse( ?=|:)? ?\d+\b",
     ],
     "resp_rate": [
@@ -88,7 +88,7 @@ IMAGING_PATTERNS = {
         r"\bradiograph\b",
     ],
     "ct": [
-        r"\bCT( scan)?\b",
+        r"\b(?-i:CT)( scan)?\b",  # upper-case only: 'ct' means count
         r"\bcomputed tomography\b",
     ],
     "mri": [
@@ -97,7 +97,7 @@ IMAGING_PATTERNS = {
     ],
     "ultrasound": [
         r"\bultrasound\b",
-        r"\bUS\b",
+        r"\b(?-i:US)\b",  # upper-case only: not the pronoun 'us'
         r"\bsonogram\b",
     ],
     "echo": [
@@ -134,6 +134,65 @@ TREATMENT_MARKERS = {
     ],
 }
 
+# r"\b" plus the first literal character of a pattern, e.g. "C" of r"\bCr ...".
+_LEADING = re.compile(r"\\b(?:\(\?-i:)?([A-Za-z0-9])")
+
+
+def _leading_chars(patterns):
+    """Lower-cased first characters of all patterns, or None if one has none."""
+    chars = set()
+    for p in patterns:
+        m = _LEADING.match(p)
+        if m is None:
+            return None
+        chars.add(m.group(1).lower())
+    return chars
+
+
+_SUPPORT_PATTERNS = [
+    p
+    for group in (LAB_PATTERNS, VITAL_PATTERNS, IMAGING_PATTERNS, TREATMENT_MARKERS)
+    for patterns in group.values()
+    for p in patterns
+]
+# Every alternative starts at a word boundary with one of these characters,
+# so one character-class test rejects most positions before the alternation
+# is tried at all. This per-position gate stands in for a whole-note
+# required-literal test like the detectors' seeds: the seeds here include
+# "k", "t" and "on ", which nearly every note contains, so such a test
+# would never skip the scan.
+_SUPPORT_LEADING = _leading_chars(_SUPPORT_PATTERNS)
+_SUPPORT_GATE = rf"\b(?=[{''.join(sorted(_SUPPORT_LEADING))}])" if _SUPPORT_LEADING else ""
+
+# Zero-width: finds every position where some pattern matches, in a single
+# pass. Consuming the union instead would hide matches overlapping another
+# pattern's ("on insulin glargine" has both "on insulin" and
+# "insulin glargine").
+_SUPPORT_UNION = "(?:" + "|".join(f"(?:{p})" for p in _SUPPORT_PATTERNS) + ")"
+_SUPPORT_STARTS = re.compile(_SUPPORT_GATE + "(?=" + _SUPPORT_UNION + ")", re.IGNORECASE)
+# The same on ASCII text, without the Unicode case folding per character.
+_SUPPORT_STARTS_ASCII = re.compile(
+    _SUPPORT_GATE + "(?=" + _SUPPORT_UNION + ")", re.IGNORECASE | re.ASCII
+)
+_SUPPORT_REGEXES = [re.compile(p, re.IGNORECASE) for p in _SUPPORT_PATTERNS]
+_SUPPORT_REGEXES_ASCII = [re.compile(p, re.IGNORECASE | re.ASCII) for p in _SUPPORT_PATTERNS]
+
+
+def _index_by_leading(patterns):
+    """Indices of the patterns to try at a position, keyed by its character."""
+    unled, index = [], {}
+    for i, p in enumerate(patterns):
+        m = _LEADING.match(p)
+        if m is None:
+            unled.append(i)
+        else:
+            index.setdefault(m.group(1).lower(), []).append(i)
+    return {ch: sorted(ids + unled) for ch, ids in index.items()}, unled
+
+
+_SUPPORT_BY_LEADING, _SUPPORT_UNLED = _index_by_leading(_SUPPORT_PATTERNS)
+_SUPPORT_ALL = range(len(_SUPPORT_PATTERNS))
+
 # ---------------------------------------------------------------------
 # EXTRACTION FUNCTION
 # ---------------------------------------------------------------------
@@ -142,21 +201,37 @@ def extract_supporting_data(text: str, max_items: int = 4) -> str:
     """
     Extracts minimal but objective supporting data from text.
     Returns a short comma-separated string.
+    Scanning stops after max_items * 4 distinct findings, so on
+    lab-heavy notes the summary is drawn from the earliest values.
     """
-    text = text.lower()
     findings = set()
-
-    for group in (LAB_PATTERNS, VITAL_PATTERNS, IMAGING_PATTERNS, TREATMENT_MARKERS):
-        for category, patterns in group.items():
-            for pattern in patterns:
-                matches = re.findall(pattern, text)
-                for m in matches:
-                    val = m[0] if isinstance(m, tuple) else m
-                    findings.add(val.strip())
+    cap = max_items * 4
+    is_ascii = text.isascii()
+    starts = _SUPPORT_STARTS_ASCII if is_ascii else _SUPPORT_STARTS
+    regexes = _SUPPORT_REGEXES_ASCII if is_ascii else _SUPPORT_REGEXES
+    # Each pattern resumes after its own last match, exactly as a separate
+    # finditer per pattern would; different patterns may overlap.
+    resume = [0] * len(regexes)
+    for start in starts.finditer(text):
+        pos = start.start()
+        # Case folding beyond ASCII can change the first character; try all.
+        if is_ascii:
+            candidates = _SUPPORT_BY_LEADING.get(text[pos].lower(), _SUPPORT_UNLED)
+        else:
+            candidates = _SUPPORT_ALL
+        for i in candidates:
+            if pos < resume[i]:
+                continue
+            m = regexes[i].match(text, pos)
+            if m:
+                resume[i] = m.end()
+                findings.add(m.group(0).strip())
+        if len(findings) >= cap:
+            break
 
     if not findings:
         return "⚠️ No supporting data"
-    return ", ".join(sorted(list(findings))[:max_items])
+    return ", ".join(sorted(findings)[:max_items])
 
 # ---------------------------------------------------------------------
 # TEST HARNESS
@@ -6,7 +6,7 @@ Detects temporal course or status descriptors in clinical text,
 such as new onset, recurrent, resolving, history of, or chronic flare.
 """
 
-import re
+from pattern_engine import PriorityMatcher, memoize_short, scan_head
 
 TEMPORAL_PATTERNS = {
     # --- New / Initial Onset ---
@@ -27,7 +27,7 @@ TEMPORAL_PATTERNS = {
     ],
     # --- Chronic Stable ---
     "chronic_stable": [
-        r"\bchronic\b.*\bstable\b",
+        r"\bchronic\b.{0,60}?\bstable\b",
         r"\bstable chronic\b",
         r"\bat baseline\b",
         r"\bunchanged\b",
@@ -76,7 +76,7 @@ TEMPORAL_PATTERNS = {
     # --- Post-Treatment or Post-Event ---
     "post_event": [
         r"\bpost[- ](MI|stroke|infection|surgery|procedure|partum|partum hemorrhage)\b",
-        r"\bafter\b.*(event|illness|episode)\b",
+        r"\bafter\b.{0,60}?(?:event|illness|episode)\b",
     ],
 }
 
@@ -93,17 +93,32 @@ TEMPORAL_PRIORITY = [
     "history_of",
 ]
 
-def detect_temporal_status(text: str) -> str:
+# Display form of each key, computed at import.
+TEMPORAL_LABELS = {key: key.replace("_", " ") for key in TEMPORAL_PRIORITY}
+
+# Compiled once at import: one fused regex per category, in priority order.
+_TEMPORAL_MATCHER = PriorityMatcher(TEMPORAL_PATTERNS, TEMPORAL_PRIORITY)
+# Problem-list phrases ("history of CVA") repeat; long notes bypass the cache.
+_search_temporal = memoize_short(_TEMPORAL_MATCHER.search)
+
+
+def detect_temporal_status(text: str, scan_window: int | None = 256) -> str:
     """
-    Scans input text for temporal or course descriptors.
+    Scans input text for temporal or course descriptors in its first
+    `scan_window` characters (scan_window=None searches all of it).
     Returns the most specific label, or 'unspecified' if none found.
     """
-    text = text.lower()
-    for key in TEMPORAL_PRIORITY:
-        for pattern in TEMPORAL_PATTERNS[key]:
-            if re.search(pattern, text):
-                return key.replace("_", " ")
-    return "unspecified"
+    key = _search_temporal(scan_head(text, scan_window))
+    return TEMPORAL_LABELS[key] if key else "unspecified"
+
+
+def detect_temporal_status_batch(texts: list, scan_window: int | None = 256) -> list:
+    """detect_temporal_status() over many texts using the batched matcher."""
+    texts = [scan_head(t, scan_window) for t in texts]
+    return [
+        TEMPORAL_LABELS[key] if key else "unspecified"
+        for key in _TEMPORAL_MATCHER.search_many(texts)
+    ]
 
 
 if __name__ == "__main__":
@@ -123,3 +138,8 @@ if __name__ == "__main__":
     print("\nTemporal status detection test run:\n" + "-" * 50)
     for t in test_cases:
         print(f"{t:<70} → {detect_temporal_status(t)}")
+
+    # "newer" cut at the scan window must not read as "new" (new onset).
+    t = "." * 253 + "newer agents"
+    print(f"{'(window cut) newer agents':<70} → {detect_temporal_status(t)}"
+          f" (full scan: {detect_temporal_status(t, scan_window=None)})")